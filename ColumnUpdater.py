@@ -15,7 +15,7 @@ Authentication:
 - Or pass via CLI flags
 
 Usage example:
-  python jira_updater.py --project-key F22E --csv updates.csv --startdate-field customfield_12345 --sleep 0.1 --dry-run
+  python jira_updater.py --project-key F22E --csv updates.csv --startdate-field customfield_12345 --dry-run
 
 CSV expected columns (use any subset):
 - IssueKey (preferred) or Summary (for matching)
@@ -38,31 +38,127 @@ Notes:
 """
 
 import argparse
+import asyncio
 import csv
+import functools
+import importlib.util
 import json
 import os
 import re
+import shelve
 import sys
+import threading
 import time
-from datetime import datetime
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from itertools import islice
+from typing import Dict, Any, Optional, List, Tuple, Iterable, Iterator
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx  # optional: only needed for --async
+except ImportError:
+    httpx = None
+
+try:
+    import orjson  # optional: faster JSON encoding/decoding
+except ImportError:
+    orjson = None
 
 DATE_FMT = "%Y-%m-%d"
+EPIC_LINK_FIELD = os.environ.get("EPIC_LINK_FIELD", "customfield_10014")
+CHUNK_SIZE = 256  # CSV rows read and dispatched per batch
+CACHE_TTL = 24 * 3600  # seconds a persisted lookup (user, version, component, project) stays valid
+_SLASH_RE = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
+
+class JiraRetry(Retry):
+    """urllib3 Retry that only re-sends POST (creates) when Jira asks us to come back later (429/503 + Retry-After)."""
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == "POST":
+            return bool(self.total) and has_retry_after and status_code in (429, 503)
+        return super().is_retry(method, status_code, has_retry_after)
+
+def make_session() -> requests.Session:
+    """Session with a keep-alive connection pool; 429/5xx are retried with backoff (honours Retry-After).
+    Once retries run out the last response is returned, so _check still reports Jira's error body."""
+    session = requests.Session()
+    retry = JiraRetry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=["GET", "PUT", "DELETE"], raise_on_status=False)
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=retry))
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+def dump_json(payload: Any) -> bytes:
+    """Request body as UTF-8 JSON bytes (orjson when installed, else the stdlib encoder)."""
+    return orjson.dumps(payload) if orjson else json.dumps(payload).encode("utf-8")
+
+def load_json(resp) -> Any:
+    """Decode a response body once, straight from bytes (orjson when installed); 204/empty bodies give {}."""
+    if resp.status_code == 204 or not resp.content:
+        return {}
+    return orjson.loads(resp.content) if orjson else json.loads(resp.content)
+
+def jql_quote(s: str) -> str:
+    """Quote a value as a JQL string literal (escapes backslashes and double quotes)."""
+    return '"' + s.replace("\\", "\\\\").replace('"', '\\"') + '"'
 
 def env(name: str, default: Optional[str] = None) -> Optional[str]:
     return os.environ.get(name, default)
 
+def link_updates(deps: List[str], direction: str) -> List[Dict[str, Any]]:
+    """issuelinks "add" operations for an edit-issue PUT. The edited issue takes the side it would have in
+    add_issue_link_is_blocked_by, so the other issue fills the remaining inward/outward slot."""
+    side = "outwardIssue" if direction == "blocked_by" else "inwardIssue"
+    return [{"add": {"type": {"name": "Blocks"}, side: {"key": dep}}} for dep in deps]
+
+class JiraAPIError(RuntimeError):
+    """Non-2xx Jira response; keeps the status and decoded body so callers can tell errors apart."""
+
+    def __init__(self, status: int, detail: Any):
+        super().__init__(f"Jira API error {status}: {detail}")
+        self.status = status
+        self.detail = detail
+
+def links_not_settable(e: Exception) -> bool:
+    """True when a fused PUT was refused because issuelinks is not on the edit screen (as opposed to, say, a bad key)."""
+    if not isinstance(e, JiraAPIError) or e.status != 400 or not isinstance(e.detail, dict):
+        return False
+    msg = str((e.detail.get("errors") or {}).get("issuelinks", "")).lower()
+    return "cannot be set" in msg or "not on the appropriate screen" in msg
+
 def normalize_date(s: str) -> Optional[str]:
-    if not s or str(s).strip() == "" or str(s).strip().lower() in {"nan", "none", "null"}:
+    if s is None:
+        return None
+    return _normalize_date_str(str(s).strip())
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_date_str(s: str) -> Optional[str]:
+    # Cached: Gantt exports repeat the same handful of milestone dates across many rows
+    if s == "" or s.lower() in {"nan", "none", "null"}:
+        return None
+    # ISO first: fromisoformat is implemented in C and (3.11+) accepts most ISO 8601 variants
+    try:
+        return datetime.fromisoformat(s).strftime(DATE_FMT)
+    except ValueError:
+        pass
+    # Fast path for m/d/Y (falling back to d/m/Y) without strptime's exception cascade
+    m = _SLASH_RE.match(s)
+    if m:
+        a, b, y = (int(g) for g in m.groups())
+        for month, day in ((a, b), (b, a)):
+            try:
+                return date(y, month, day).strftime(DATE_FMT)
+            except ValueError:
+                pass
         return None
-    s = str(s).strip()
-    # Try multiple formats robustly
+    # Try multiple formats robustly; most common first ("%Y-%m-%d" still catches unpadded 2025-8-9)
     fmts = [
-        "%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%m/%d/%Y", "%m-%d-%Y",
-        "%d %b %Y", "%d %B %Y", "%b %d %Y", "%B %d %Y",
-        "%Y/%m/%d"
+        "%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d", "%m-%d-%Y", "%d-%m-%Y",
+        "%d %b %Y", "%d %B %Y", "%b %d %Y", "%B %d %Y"
     ]
     for f in fmts:
         try:
@@ -70,116 +166,226 @@ def normalize_date(s: str) -> Optional[str]:
             return dt.strftime(DATE_FMT)
         except Exception:
             pass
-    # Try ISO partials (e.g., 2025-8-9)
-    try:
-        dt = datetime.fromisoformat(s)
-        return dt.strftime(DATE_FMT)
-    except Exception:
-        return None
+    return None
+
+_MISS = object()
+
+class DiskCache:
+    """Lookups that rarely change (users, versions, components, project meta) persisted across runs via shelve."""
+
+    def __init__(self, path: str, base_url: str, ttl: float = CACHE_TTL):
+        self.db = shelve.open(path)
+        self.base = base_url.rstrip("/")
+        self.ttl = ttl
+        self.lock = threading.Lock()
+
+    def _key(self, kind: str, key: str) -> str:
+        return f"{self.base}|{kind}|{key}"
+
+    def get(self, kind: str, key: str) -> Any:
+        with self.lock:
+            entry = self.db.get(self._key(kind, key))
+        if entry is None or time.time() - entry[0] > self.ttl:
+            return _MISS
+        return entry[1]
+
+    def set(self, kind: str, key: str, value: Any):
+        with self.lock:
+            self.db[self._key(kind, key)] = (time.time(), value)
+
+    def clear(self):
+        with self.lock:
+            self.db.clear()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
 
 class Jira:
-    def __init__(self, base_url: str, user: str, token: str, sleep: float = 0.1):
+    def __init__(self, base_url: str, user: str, token: str, sleep: float = 0.0,
+                 session: Optional[requests.Session] = None, cache: Optional[DiskCache] = None):
         self.base = base_url.rstrip("/")
-        self.session = requests.Session()
+        self.session = session or make_session()
         self.session.auth = (user, token)
         self.session.headers.update({"Accept": "application/json", "Content-Type": "application/json"})
         self.sleep = sleep
+        self._throttle_lock = threading.Lock()
+        self._next_call = 0.0
         self.user_cache: Dict[str, Optional[str]] = {}
         self.version_cache: Dict[str, Dict[str, Any]] = {}
         self.component_cache: Dict[str, Dict[str, Any]] = {}
+        self.cache = cache
+        self.fuse_links = True  # send dependency links inside the field PUT until Jira rejects that
+        # Single-entry memos for the previous lookup: CSVs tend to repeat the same assignee/version in streaks.
+        # Each is one tuple so concurrent readers (warm_cache) never see a key paired with another key's value.
+        self._last_user: Tuple[Optional[str], Optional[str]] = (None, None)
+        self._last_version: Tuple[Optional[str], Optional[str], Any] = (None, None, None)
+        self._last_components: Tuple[Optional[str], Any] = (None, None)
+
+    def _cached(self, kind: str, key: str) -> Any:
+        return self.cache.get(kind, key) if self.cache else _MISS
+
+    def _persist(self, kind: str, key: str, value: Any):
+        if self.cache:
+            self.cache.set(kind, key, value)
 
     def _url(self, path: str) -> str:
         return f"{self.base}{path}"
 
     def get(self, path: str, params: Optional[dict] = None) -> requests.Response:
-        r = self.session.get(self._url(path), params=params)
         self._throttle()
+        r = self.session.get(self._url(path), params=params)
         self._check(r)
         return r
 
     def post(self, path: str, payload: dict) -> requests.Response:
-        r = self.session.post(self._url(path), data=json.dumps(payload))
         self._throttle()
+        r = self.session.post(self._url(path), data=dump_json(payload))
         self._check(r)
         return r
 
     def put(self, path: str, payload: dict) -> requests.Response:
-        r = self.session.put(self._url(path), data=json.dumps(payload))
         self._throttle()
+        r = self.session.put(self._url(path), data=dump_json(payload))
         self._check(r)
         return r
 
     def _throttle(self):
-        if self.sleep > 0:
-            time.sleep(self.sleep)
+        # Space calls at least `sleep` seconds apart across all worker threads
+        if self.sleep <= 0:
+            return
+        with self._throttle_lock:
+            now = time.monotonic()
+            wait = self._next_call - now
+            self._next_call = max(now, self._next_call) + self.sleep
+        if wait > 0:
+            time.sleep(wait)
 
     def _check(self, resp: requests.Response):
         if not resp.ok:
             try:
-                detail = resp.json()
+                detail = load_json(resp)
             except Exception:
                 detail = resp.text
-            raise RuntimeError(f"Jira API error {resp.status_code}: {detail}")
+            raise JiraAPIError(resp.status_code, detail)
 
     # --------- Helpers ---------
-    def search_issue_by_summary(self, project_key: str, summary: str) -> Optional[str]:
-        # Exact match on summary to be safe
-        jql = f'project = "{project_key}" AND summary ~ "\"{summary}\"" ORDER BY created DESC'
-        r = self.post("/rest/api/3/search", {"jql": jql, "maxResults": 5, "fields": ["summary", "issuetype"]})
-        issues = r.json().get("issues", [])
-        # Prefer exact summary match (case-insensitive)
-        for it in issues:
-            if it["fields"]["summary"].strip().lower() == summary.strip().lower():
-                return it["key"]
-        # fallback first
-        return issues[0]["key"] if issues else None
+    def summary_index(self, project_key: str) -> Dict[str, str]:
+        """One paginated scan of the project -> {summary.lower(): key}; newest issue wins on duplicates."""
+        payload: Dict[str, Any] = {
+            "jql": f"project = {jql_quote(project_key)} ORDER BY created DESC",
+            "maxResults": 100,
+            "fields": ["summary"],
+        }
+        index: Dict[str, str] = {}
+        while True:
+            data = load_json(self.post("/rest/api/3/search/jql", payload))
+            for it in data.get("issues", []):
+                index.setdefault(it["fields"]["summary"].strip().lower(), it["key"])
+            token = data.get("nextPageToken")
+            if not token:
+                return index
+            payload["nextPageToken"] = token
 
     def resolve_user_account_id(self, email: str) -> Optional[str]:
+        last_email, last_acct = self._last_user
+        if email == last_email:
+            return last_acct
         if email in self.user_cache:
+            self._last_user = (email, self.user_cache[email])
             return self.user_cache[email]
-        # Cloud: /user/search?query=
-        r = self.get("/rest/api/3/user/search", params={"query": email})
-        users = r.json()
-        acct = users[0]["accountId"] if users else None
+        acct = self._cached("user", email)
+        if acct is _MISS or acct is None:  # None: a miss persisted by an older version; look again
+            # Cloud: /user/search?query=
+            r = self.get("/rest/api/3/user/search", params={"query": email})
+            users = load_json(r)
+            acct = users[0]["accountId"] if users else None
+            # Only real ids go to disk: someone not yet invited should resolve on the next run, not after CACHE_TTL
+            if acct:
+                self._persist("user", email, acct)
+            else:
+                print(f"WARNING: no Jira user found for {email}; assignee left unset", file=sys.stderr)
         self.user_cache[email] = acct
+        self._last_user = (email, acct)
         return acct
 
     def get_or_create_version(self, project_id: str, name: str) -> Dict[str, Any]:
+        last_project, last_name, last_v = self._last_version
+        if name == last_name and project_id == last_project:
+            return last_v
         if project_id not in self.version_cache:
             self.version_cache[project_id] = {}
         if name in self.version_cache[project_id]:
-            return self.version_cache[project_id][name]
+            v = self.version_cache[project_id][name]
+            self._last_version = (project_id, name, v)
+            return v
+        v = self._cached("version", f"{project_id}:{name}")
+        if v is not _MISS:
+            self.version_cache[project_id][name] = v
+            self._last_version = (project_id, name, v)
+            return v
         # List versions
         r = self.get(f"/rest/api/3/project/{project_id}/versions")
-        versions = r.json()
+        versions = load_json(r)
         for v in versions:
             if v["name"].strip().lower() == name.strip().lower():
-                self.version_cache[project_id][name] = v
-                return v
-        # Create new version
-        payload = {"name": name, "projectId": project_id}
-        v = self.post("/rest/api/3/version", payload).json()
+                break
+        else:
+            # Create new version
+            payload = {"name": name, "projectId": project_id}
+            v = load_json(self.post("/rest/api/3/version", payload))
         self.version_cache[project_id][name] = v
+        self._persist("version", f"{project_id}:{name}", v)
+        self._last_version = (project_id, name, v)
         return v
 
     def list_project_components(self, project_id: str) -> Dict[str, Any]:
+        last_project, last_comps = self._last_components
+        if project_id == last_project:
+            return last_comps
         if project_id in self.component_cache:
-            return self.component_cache[project_id]
-        r = self.get(f"/rest/api/3/project/{project_id}/components")
-        comps = {c["name"].strip().lower(): c for c in r.json()}
+            comps = self.component_cache[project_id]
+            self._last_components = (project_id, comps)
+            return comps
+        comps = self._cached("components", project_id)
+        if comps is _MISS:
+            r = self.get(f"/rest/api/3/project/{project_id}/components")
+            comps = {c["name"].strip().lower(): c for c in load_json(r)}
+            self._persist("components", project_id, comps)
         self.component_cache[project_id] = comps
+        self._last_components = (project_id, comps)
         return comps
 
+    def create_component(self, project_id: str, name: str) -> Dict[str, Any]:
+        created = load_json(self.post("/rest/api/3/component", {"name": name, "projectId": project_id}))
+        comps = self.list_project_components(project_id)
+        comps[name.lower()] = created
+        self._persist("components", project_id, comps)
+        return created
+
     def get_project_meta(self, project_key: str) -> Dict[str, Any]:
-        r = self.get(f"/rest/api/3/project/{project_key}")
-        return r.json()
+        meta = self._cached("project", project_key)
+        if meta is _MISS:
+            meta = load_json(self.get(f"/rest/api/3/project/{project_key}"))
+            self._persist("project", project_key, meta)
+        return meta
+
+    def warm_cache(self, project: Dict[str, Any], emails: Iterable[str], workers: int = 8):
+        """Prefetch project components and resolve all assignee emails concurrently."""
+        self.list_project_components(project["id"])
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(self.resolve_user_account_id, set(emails)))
 
     # --------- Update ---------
-    def update_issue_fields(self, issue_key: str, fields: Dict[str, Any], dry_run: bool = True):
+    def update_issue_fields(self, issue_key: str, fields: Dict[str, Any], dry_run: bool = True,
+                            links: Optional[List[Dict[str, Any]]] = None):
+        body: Dict[str, Any] = {"fields": fields}
+        if links:
+            body["update"] = {"issuelinks": links}
         if dry_run:
-            return {"dry_run": True, "issue": issue_key, "fields": fields}
-        r = self.put(f"/rest/api/3/issue/{issue_key}", {"fields": fields})
-        return r.json() if r.text else {"ok": True}
+            return {"dry_run": True, "issue": issue_key, **body}
+        r = self.put(f"/rest/api/3/issue/{issue_key}", body)
+        return load_json(r) or {"ok": True}
 
     def add_issue_link_is_blocked_by(self, issue_key: str, depends_on_key: str, dry_run: bool = True):
         payload = {
@@ -189,10 +395,128 @@ class Jira:
         }
         if dry_run:
             return {"dry_run": True, "link": payload}
-        return self.post("/rest/api/3/issueLink", payload).json()
+        return load_json(self.post("/rest/api/3/issueLink", payload)) or {"ok": True}
+
+class AsyncJira:
+    """httpx client for the --async update phase: field PUTs and issue links as coroutines on one event loop."""
+
+    def __init__(self, base_url: str, user: str, token: str, sleep: float = 0.0, concurrency: int = 20):
+        self.base = base_url.rstrip("/")
+        self.client = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,  # HTTP/2 needs the h2 extra (pip install httpx[http2])
+            auth=(user, token),
+            headers={"Accept": "application/json", "Content-Type": "application/json"},
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+            timeout=30.0,
+        )
+        self.sem = asyncio.Semaphore(concurrency)
+        self.sleep = sleep
+        self._next_call = 0.0
+        self.fuse_links = True  # same fallback switch as Jira.fuse_links
+
+    async def _throttle(self):
+        # Same spacing as Jira._throttle; no lock needed since the bookkeeping never yields to the loop
+        if self.sleep <= 0:
+            return
+        now = time.monotonic()
+        wait = self._next_call - now
+        self._next_call = max(now, self._next_call) + self.sleep
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    @staticmethod
+    def _retryable(method: str, r: "httpx.Response") -> bool:
+        # Mirrors make_session's JiraRetry: a POST is only re-sent when Jira asked us to come back later
+        if method == "POST":
+            return r.status_code in (429, 503) and "Retry-After" in r.headers
+        return r.status_code in (429, 500, 502, 503, 504)
+
+    async def _send(self, method: str, path: str, payload: dict) -> "httpx.Response":
+        await self._throttle()
+        async with self.sem:
+            for attempt in range(4):
+                r = await self.client.request(method, f"{self.base}{path}", content=dump_json(payload))
+                if attempt == 3 or not self._retryable(method, r):
+                    break
+                try:
+                    delay = float(r.headers.get("Retry-After", ""))
+                except ValueError:
+                    delay = 0.5 * 2 ** attempt
+                await asyncio.sleep(delay)
+        if r.is_error:
+            try:
+                detail = load_json(r)
+            except Exception:
+                detail = r.text
+            raise JiraAPIError(r.status_code, detail)
+        return r
+
+    async def update_issue_fields(self, issue_key: str, fields: Dict[str, Any], dry_run: bool = True,
+                                  links: Optional[List[Dict[str, Any]]] = None):
+        body: Dict[str, Any] = {"fields": fields}
+        if links:
+            body["update"] = {"issuelinks": links}
+        if dry_run:
+            return {"dry_run": True, "issue": issue_key, **body}
+        r = await self._send("PUT", f"/rest/api/3/issue/{issue_key}", body)
+        return load_json(r) or {"ok": True}
+
+    async def add_issue_link_is_blocked_by(self, issue_key: str, depends_on_key: str, dry_run: bool = True):
+        payload = {
+            "type": {"name": "Blocks"},
+            "inwardIssue": {"key": issue_key},
+            "outwardIssue": {"key": depends_on_key}
+        }
+        if dry_run:
+            return {"dry_run": True, "link": payload}
+        r = await self._send("POST", "/rest/api/3/issueLink", payload)
+        return load_json(r) or {"ok": True}
+
+    async def apply_row(self, i: int, key: str, fields: Dict[str, Any], deps: List[str],
+                        direction: str, dry_run: bool) -> Tuple[str, bool, int]:
+        """Coroutine twin of apply_row(); the links for one issue run concurrently."""
+        if deps and self.fuse_links:
+            try:
+                await self.update_issue_fields(key, fields, dry_run=dry_run, links=link_updates(deps, direction))
+                return key, True, len(deps)
+            except Exception as e:
+                print(f"[{i}] fused update of {key} failed, retrying fields and links separately: {e}", file=sys.stderr)
+                if links_not_settable(e):
+                    self.fuse_links = False
+        ok = False
+        try:
+            await self.update_issue_fields(key, fields, dry_run=dry_run)
+            ok = True
+        except Exception as e:
+            print(f"[{i}] ERROR updating {key}: {e}", file=sys.stderr)
+
+        pairs = [(key, dep) if direction == "blocked_by" else (dep, key) for dep in deps]
+        results = await asyncio.gather(*(self.add_issue_link_is_blocked_by(a, b, dry_run=dry_run) for a, b in pairs),
+                                       return_exceptions=True)
+        for dep, res in zip(deps, results):
+            if isinstance(res, Exception):
+                print(f"[{i}] ERROR linking {key} <-> {dep}: {res}", file=sys.stderr)
+        return key, ok, sum(not isinstance(res, Exception) for res in results)
+
+    async def apply_key_rows(self, rows: List[Tuple[int, str, Dict[str, Any], List[str]]],
+                             direction: str, dry_run: bool) -> List[Tuple[str, bool, int]]:
+        return [await self.apply_row(*job, direction, dry_run) for job in rows]
+
+    async def apply_rows(self, jobs: List[Tuple[int, str, Dict[str, Any], List[str]]],
+                         direction: str, dry_run: bool) -> List[Tuple[str, bool, int]]:
+        groups = await asyncio.gather(*(self.apply_key_rows(rows, direction, dry_run) for rows in group_by_key(jobs)))
+        return [res for group in groups for res in group]
+
+    async def aclose(self):
+        await self.client.aclose()
+
+def split_list(value: Optional[str]) -> List[str]:
+    """Comma-separated cell -> stripped, non-empty items."""
+    return [x for x in map(str.strip, (value or "").split(",")) if x]
 
 def build_fields(row: Dict[str, Any], startdate_field: Optional[str], jira: Jira, project: Dict[str, Any]) -> Dict[str, Any]:
     fields: Dict[str, Any] = {}
+    project_id = project["id"]
 
     # Dates
     start = normalize_date(row.get("StartDate", ""))
@@ -203,66 +527,112 @@ def build_fields(row: Dict[str, Any], startdate_field: Optional[str], jira: Jira
         fields["duedate"] = due
 
     # Description
-    desc = row.get("Description")
-    if isinstance(desc, str) and desc.strip():
+    desc = row.get("Description") or ""
+    if desc.strip():
         fields["description"] = desc
 
     # Priority
-    prio = row.get("Priority")
-    if isinstance(prio, str) and prio.strip():
-        fields["priority"] = {"name": prio.strip()}
+    if prio := (row.get("Priority") or "").strip():
+        fields["priority"] = {"name": prio}
 
     # Labels
-    labels = row.get("Labels")
-    if isinstance(labels, str) and labels.strip():
-        fields["labels"] = [x.strip() for x in labels.split(",") if x.strip()]
+    if labels := split_list(row.get("Labels")):
+        fields["labels"] = labels
 
     # Components
-    comps = row.get("Components")
-    if isinstance(comps, str) and comps.strip():
-        comp_map = jira.list_project_components(project["id"])
+    if comps := split_list(row.get("Components")):
+        comp_map = jira.list_project_components(project_id)
         fields["components"] = []
-        for name in [x.strip() for x in comps.split(",") if x.strip()]:
+        for name in comps:
             c = comp_map.get(name.lower())
             if c:
                 fields["components"].append({"id": c["id"]})
             else:
                 # Create component if missing
-                created = jira.post("/rest/api/3/component", {"name": name, "projectId": project["id"]}).json()
-                comp_map[name.lower()] = created
+                created = jira.create_component(project_id, name)
                 fields["components"].append({"id": created["id"]})
 
     # FixVersions
-    vers = row.get("FixVersions")
-    if isinstance(vers, str) and vers.strip():
-        project_id = project["id"]
-        fields["fixVersions"] = []
-        for vname in [x.strip() for x in vers.split(",") if x.strip()]:
-            v = jira.get_or_create_version(project_id, vname)
-            fields["fixVersions"].append({"id": v["id"]})
+    if vers := split_list(row.get("FixVersions")):
+        fields["fixVersions"] = [{"id": jira.get_or_create_version(project_id, vname)["id"]} for vname in vers]
 
     # Assignee by email -> accountId (Cloud)
-    ass_email = row.get("AssigneeEmail")
-    if isinstance(ass_email, str) and ass_email.strip():
-        acct = jira.resolve_user_account_id(ass_email.strip())
+    if ass_email := (row.get("AssigneeEmail") or "").strip():
+        acct = jira.resolve_user_account_id(ass_email)
         if acct:
             fields["assignee"] = {"accountId": acct}
 
-    # Epic link (Cloud often customfield_10014)
-    epic_key = row.get("EpicKey")
-    if isinstance(epic_key, str) and epic_key.strip():
-        # Some Cloud sites still use customfield_10014 for Epic Link. Allow override via env or CLI?
-        epic_field = os.environ.get("EPIC_LINK_FIELD", "customfield_10014")
-        fields[epic_field] = epic_key.strip()
+    # Epic link (Cloud often customfield_10014; override with EPIC_LINK_FIELD)
+    if epic_key := (row.get("EpicKey") or "").strip():
+        fields[EPIC_LINK_FIELD] = epic_key
 
     # Parent for subtasks (by key)
-    parent_key = row.get("ParentKey")
-    if isinstance(parent_key, str) and parent_key.strip():
-        fields["parent"] = {"key": parent_key.strip()}
+    if parent_key := (row.get("ParentKey") or "").strip():
+        fields["parent"] = {"key": parent_key}
 
     return fields
 
-def main():
+def iter_chunks(it: Iterable, size: int) -> Iterator[list]:
+    it = iter(it)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def group_by_key(jobs: List[Tuple[int, str, Dict[str, Any], List[str]]]
+                 ) -> List[List[Tuple[int, str, Dict[str, Any], List[str]]]]:
+    """Rows for the same issue, in CSV order. Each group is applied sequentially so later rows still win."""
+    groups: Dict[str, List[Tuple[int, str, Dict[str, Any], List[str]]]] = {}
+    for job in jobs:
+        groups.setdefault(job[1], []).append(job)
+    return list(groups.values())
+
+def apply_row(jira: Jira, i: int, key: str, fields: Dict[str, Any], deps: List[str],
+              direction: str, dry_run: bool) -> Tuple[str, bool, int]:
+    """Push one row's fields and dependency links. Runs on a worker thread; returns (key, updated, links made)."""
+    # One PUT carrying both fields and links; if that fails, retry the row the split way below.
+    # Only a rejection saying issuelinks cannot be set (not on the edit screen) turns fusing off for the run.
+    if deps and jira.fuse_links:
+        try:
+            jira.update_issue_fields(key, fields, dry_run=dry_run, links=link_updates(deps, direction))
+            return key, True, len(deps)
+        except Exception as e:
+            print(f"[{i}] fused update of {key} failed, retrying fields and links separately: {e}", file=sys.stderr)
+            if links_not_settable(e):
+                jira.fuse_links = False
+    ok = False
+    linked = 0
+    try:
+        jira.update_issue_fields(key, fields, dry_run=dry_run)
+        ok = True
+    except Exception as e:
+        print(f"[{i}] ERROR updating {key}: {e}", file=sys.stderr)
+
+    for dep in deps:
+        try:
+            if direction == "blocked_by":
+                jira.add_issue_link_is_blocked_by(key, dep, dry_run=dry_run)
+            else:
+                # Opposite direction
+                jira.add_issue_link_is_blocked_by(dep, key, dry_run=dry_run)
+            linked += 1
+        except Exception as e:
+            print(f"[{i}] ERROR linking {key} <-> {dep}: {e}", file=sys.stderr)
+
+    return key, ok, linked
+
+def apply_key_rows(jira: Jira, rows: List[Tuple[int, str, Dict[str, Any], List[str]]],
+                   direction: str, dry_run: bool) -> List[Tuple[str, bool, int]]:
+    return [apply_row(jira, *job, direction, dry_run) for job in rows]
+
+def apply_rows_threaded(ex: ThreadPoolExecutor, jira: Jira, jobs: List[Tuple[int, str, Dict[str, Any], List[str]]],
+                        direction: str, dry_run: bool) -> List[Tuple[str, bool, int]]:
+    # One task per issue key: rows that touch the same issue must not PUT concurrently
+    futures = [ex.submit(apply_key_rows, jira, rows, direction, dry_run) for rows in group_by_key(jobs)]
+    return [res for fut in as_completed(futures) for res in fut.result()]
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     ap = argparse.ArgumentParser()
     ap.add_argument("--jira-url", default=env("JIRA_URL"), help="Base URL, e.g. https://your-domain.atlassian.net")
     ap.add_argument("--jira-user", default=env("JIRA_USER"), help="Email/username for Jira")
@@ -270,75 +640,126 @@ def main():
     ap.add_argument("--project-key", required=True, help="Project key, e.g. F22E")
     ap.add_argument("--csv", required=True, help="CSV path")
     ap.add_argument("--startdate-field", default=os.environ.get("START_DATE_FIELD"), help="Custom field id for Start date (e.g., customfield_12345)")
-    ap.add_argument("--sleep", type=float, default=0.1, help="Seconds to sleep between API calls")
+    ap.add_argument("--sleep", type=float, default=0.0, help="Seconds to sleep between API calls (429s are already retried with backoff)")
     ap.add_argument("--dry-run", action="store_true", help="Print actions without updating Jira")
+    ap.add_argument("--workers", type=int, default=8, help="Concurrent update requests (shares one connection pool)")
+    ap.add_argument("--async", dest="use_async", action="store_true",
+                    help="Send updates with httpx/asyncio instead of threads; --workers bounds in-flight requests")
+    ap.add_argument("--cache-file", default=".jira_cache.db", help="Where user/version/component lookups are persisted between runs")
+    ap.add_argument("--no-cache", action="store_true", help="Do not read or write the on-disk lookup cache")
+    ap.add_argument("--clear-cache", action="store_true", help="Empty the on-disk lookup cache before running")
+    ap.add_argument("--warm-cache", action="store_true", help="Prefetch components and all AssigneeEmail lookups before updating")
     ap.add_argument("--max", type=int, default=None, help="Update at most N rows (for testing)")
     ap.add_argument("--dependencies-direction", choices=["blocked_by", "blocks"], default="blocked_by",
                     help="If 'blocked_by', creates links so the issue is blocked by listed Dependencies. If 'blocks', the issue blocks the listed issues.")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     if not args.jira_url or not args.jira_user or not args.jira_token:
         ap.error("Jira credentials are missing. Set env vars JIRA_URL, JIRA_USER, JIRA_TOKEN or pass flags.")
-
-    jira = Jira(args.jira_url, args.jira_user, args.jira_token, sleep=args.sleep)
+    if args.use_async and httpx is None:
+        ap.error("--async needs httpx: pip install httpx")
+    return args
+
+def run(args: argparse.Namespace, session: Optional[requests.Session] = None,
+        known_keys: Optional[Dict[str, str]] = None):
+    """Entry point shared by the CLI and Runner.py; pass `session` to reuse an existing connection pool and
+    `known_keys` ({summary.lower(): key}, e.g. from Importer.run) for issues too new to trust search for."""
+    cache = None if args.no_cache else DiskCache(args.cache_file, args.jira_url)
+    try:
+        if cache and args.clear_cache:
+            cache.clear()
+        _run(args, Jira(args.jira_url, args.jira_user, args.jira_token, sleep=args.sleep, session=session, cache=cache),
+             known_keys or {})
+    finally:
+        if cache:
+            cache.close()
+
+def _run(args: argparse.Namespace, jira: Jira, known_keys: Dict[str, str]):
     project = jira.get_project_meta(args.project_key)
 
-    # Read CSV
-    with open(args.csv, newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    if args.warm_cache:
+        with open(args.csv, newline="", encoding="utf-8-sig") as f:
+            emails = [e for e in ((row.get("AssigneeEmail") or "").strip() for row in csv.DictReader(f)) if e]
+        jira.warm_cache(project, emails, workers=args.workers)
 
     updated = 0
     linked = 0
     skipped = 0
-
-    for i, row in enumerate(rows, start=1):
-        if args.max and updated >= args.max:
-            break
-
-        key = (row.get("IssueKey") or "").strip()
-        summary = (row.get("Summary") or "").strip()
-
-        if not key:
-            if not summary:
-                print(f"[{i}] SKIP: row has neither IssueKey nor Summary")
-                skipped += 1
-                continue
-            match = jira.search_issue_by_summary(args.project_key, summary)
-            if not match:
-                print(f"[{i}] SKIP: no issue found for Summary='{summary}'")
-                skipped += 1
-                continue
-            key = match
-
-        fields = build_fields(row, args.startdate_field, jira, project)
-
-        try:
-            jira.update_issue_fields(key, fields, dry_run=args.dry_run)
-            updated += 1
-            if updated % 10 == 0:
-                print(f"[{updated}] Updated through {key}")
-        except Exception as e:
-            print(f"[{i}] ERROR updating {key}: {e}", file=sys.stderr)
-
-        # Dependencies
-        deps_raw = row.get("Dependencies")
-        if isinstance(deps_raw, str) and deps_raw.strip():
-            deps = [x.strip() for x in deps_raw.split(",") if x.strip()]
-            for dep in deps:
-                try:
-                    if args.dependencies_direction == "blocked_by":
-                        jira.add_issue_link_is_blocked_by(key, dep, dry_run=args.dry_run)
-                    else:
-                        # Opposite direction
-                        jira.add_issue_link_is_blocked_by(dep, key, dry_run=args.dry_run)
-                    linked += 1
-                except Exception as e:
-                    print(f"[{i}] ERROR linking {key} <-> {dep}: {e}", file=sys.stderr)
+    queued = 0
+    by_summary: Optional[Dict[str, str]] = None
+
+    # Updates run concurrently: on a thread pool sharing the session, or with --async as coroutines
+    loop = ajira = ex = None
+    if args.use_async:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        ajira = AsyncJira(args.jira_url, args.jira_user, args.jira_token, sleep=args.sleep, concurrency=args.workers)
+    else:
+        ex = ThreadPoolExecutor(max_workers=args.workers)
+
+    # Stream the CSV in chunks: keys and payloads are resolved serially (build_fields fills the
+    # user/version/component caches), then each chunk's PUT/link calls are dispatched at once.
+    try:
+        with open(args.csv, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            for chunk in iter_chunks(enumerate(reader, start=1), CHUNK_SIZE):
+                jobs: List[Tuple[int, str, Dict[str, Any], List[str]]] = []
+                for i, row in chunk:
+                    if args.max and queued >= args.max:
+                        break
+
+                    key = (row.get("IssueKey") or "").strip()
+                    summary = (row.get("Summary") or "").strip()
+
+                    if not key:
+                        if not summary:
+                            print(f"[{i}] SKIP: row has neither IssueKey nor Summary")
+                            skipped += 1
+                            continue
+                        # Issues Importer just created may not be searchable yet, so its keys are used first
+                        match = known_keys.get(summary.lower())
+                        if not match:
+                            if by_summary is None:
+                                # Only scan the project if some row actually needs matching by Summary
+                                by_summary = jira.summary_index(args.project_key)
+                            match = by_summary.get(summary.lower())
+                        if not match:
+                            print(f"[{i}] SKIP: no issue found for Summary='{summary}'")
+                            skipped += 1
+                            continue
+                        key = match
+
+                    fields = build_fields(row, args.startdate_field, jira, project)
+                    jobs.append((i, key, fields, split_list(row.get("Dependencies"))))
+                    queued += 1
+
+                if ajira:
+                    results = loop.run_until_complete(ajira.apply_rows(jobs, args.dependencies_direction, args.dry_run))
+                else:
+                    results = apply_rows_threaded(ex, jira, jobs, args.dependencies_direction, args.dry_run)
+                for key, ok, n_linked in results:
+                    linked += n_linked
+                    if ok:
+                        updated += 1
+                        if updated % 10 == 0:
+                            print(f"[{updated}] Updated through {key}")
+
+                if args.max and queued >= args.max:
+                    break
+    finally:
+        if ajira:
+            loop.run_until_complete(ajira.aclose())
+            loop.close()
+            asyncio.set_event_loop(None)  # don't leave a closed loop installed for the caller (e.g. Runner.py)
+        if ex:
+            ex.shutdown()
 
     print(f"Done. Updated: {updated}, Linked: {linked}, Skipped: {skipped}. Dry-run={args.dry_run}")
     if args.dry_run:
         print("No changes were made. Remove --dry-run to apply updates.")
 
+def main():
+    run(parse_args())
+
 if __name__ == "__main__":
     main()
@@ -1,10 +1,55 @@
 #!/usr/bin/env python3
-import csv, os, argparse, time, json, requests
+import csv, os, re, argparse, time, json, requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # optional: faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+def load_json(r):
+    # Decode the body once from bytes (orjson when installed); 204/empty bodies give {}
+    if r.status_code == 204 or not r.content:
+        return {}
+    return orjson.loads(r.content) if orjson else json.loads(r.content)
+
+def jql_quote(s):
+    # JQL string literal: escape backslashes and double quotes
+    return '"' + s.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+# Lucene query syntax characters; the summary analyzer splits words on them anyway, so matching is unaffected
+TEXT_RESERVED = re.compile(r'[+\-&|!(){}\[\]^~*?\\:"/]')
+
+def jql_phrase(s):
+    # Text-search phrase: reserved characters blanked out, quoted for Lucene (words together and in order), then for JQL
+    return jql_quote('"' + TEXT_RESERVED.sub(' ', s) + '"')
+
+def dump_json(payload):
+    # UTF-8 JSON bytes, via orjson when installed
+    return orjson.dumps(payload) if orjson else json.dumps(payload).encode('utf-8')
+
+class JiraRetry(Retry):
+    # Only re-send POST when Jira asks us to come back later (429/503 + Retry-After); a 5xx may already have created it
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method.upper() == "POST":
+            return bool(self.total) and has_retry_after and status_code in (429, 503)
+        return super().is_retry(method, status_code, has_retry_after)
+
+def make_session():
+    # Keep-alive pool; 429/5xx are retried with backoff (honours Retry-After).
+    # raise_on_status=False: once retries run out we get the last response back for _check
+    s = requests.Session()
+    retry = JiraRetry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=["GET", "PUT", "DELETE"], raise_on_status=False)
+    s.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=retry))
+    s.headers["Connection"] = "keep-alive"
+    return s
 
 class Jira:
-    def __init__(self, base_url, user, token, sleep=0.0):
+    def __init__(self, base_url, user, token, sleep=0.0, session=None):
         self.base_url = base_url.rstrip('/')
-        self.s = requests.Session()
+        self.s = session or make_session()
         self.s.auth = (user, token)
         self.sleep = sleep
 
@@ -18,7 +63,7 @@ class Jira:
     def _check(self, r):
         if not r.ok:
             try:
-                detail = r.json()
+                detail = load_json(r)
             except Exception:
                 detail = r.text
             raise RuntimeError(f"Jira API error {r.status_code}: {detail}")
@@ -27,16 +72,44 @@ class Jira:
         r = self.s.get(self._u(path)); self._t(); self._check(r); return r
 
     def post(self, path, payload):
-        r = self.s.post(self._u(path), data=json.dumps(payload), headers={'Content-Type': 'application/json'})
+        r = self.s.post(self._u(path), data=dump_json(payload), headers={'Content-Type': 'application/json'})
         self._t()
         self._check(r)
         return r
 
-    def search_by_summary(self, project_key, summary):
-        jql = f'project = "{project_key}" AND summary ~ "{summary}"'
-        payload = {"jql": jql, "maxResults": 10, "fields": ["summary"]}
-        r = self.post("/rest/api/3/search", payload)
-        return r.json()
+    def _search_summaries(self, project_key, group, found):
+        # One paginated OR'ed phrase search; text search is fuzzy, so only exact (case-insensitive) titles are kept
+        targets = set(group)
+        clauses = " OR ".join(f"summary ~ {jql_phrase(s)}" for s in group)
+        payload = {"jql": f"project = {jql_quote(project_key)} AND ({clauses})", "maxResults": 100, "fields": ["summary"]}
+        while True:
+            data = load_json(self.post("/rest/api/3/search/jql", payload))
+            for it in data.get("issues", []):
+                name = it["fields"]["summary"].strip().lower()
+                if name in targets:
+                    found.setdefault(name, it["key"])
+            token = data.get("nextPageToken")
+            if not token:
+                break
+            payload["nextPageToken"] = token
+
+    def search_keys_by_summary(self, project_key, summaries, chunk=50):
+        """Resolve many summaries with a few OR'ed JQL searches -> {summary.lower(): key} (exact matches only)."""
+        wanted = sorted({s.strip().lower() for s in summaries if s and s.strip()})
+        found = {}
+        for start in range(0, len(wanted), chunk):
+            group = wanted[start:start + chunk]
+            try:
+                self._search_summaries(project_key, group, found)
+            except RuntimeError as e:
+                # A single summary Jira refuses to parse fails the whole query; redo this chunk one summary at a time
+                print(f"[WARN] batched summary search failed, retrying {len(group)} summaries one by one: {e}")
+                for s in group:
+                    try:
+                        self._search_summaries(project_key, [s], found)
+                    except RuntimeError as e:
+                        print(f"[ERROR] searching for summary '{s}': {e}")
+        return found
 
     def link_is_blocked_by(self, issue_key: str, depends_on_key: str, dry: bool=True):
         payload = {
@@ -48,14 +121,14 @@ class Jira:
             return {"dry_run": True, "link": payload}
         r = self.post("/rest/api/3/issueLink", payload)
         # Handle empty body responses safely
-        if (r.status_code in (200, 201, 204)) and (not (r.text or "").strip()):
+        if (r.status_code in (200, 201, 204)) and (not r.content.strip()):
             return {"ok": True, "status": r.status_code}
         try:
-            return r.json()
+            return load_json(r)
         except Exception:
             return {"ok": r.ok, "status": r.status_code, "text": r.text}
 
-def main():
+def parse_args(argv=None):
     ap = argparse.ArgumentParser()
     ap.add_argument('--jira-url', default=os.getenv('JIRA_URL'))
     ap.add_argument('--jira-user', default=os.getenv('JIRA_USER'))
@@ -64,32 +137,31 @@ def main():
     ap.add_argument('--csv', required=True)
     ap.add_argument('--dry-run', action='store_true')
     ap.add_argument('--sleep', type=float, default=0.0)
-    args = ap.parse_args()
+    return ap.parse_args(argv)
 
-    jira = Jira(args.jira_url, args.jira_user, args.jira_token, sleep=args.sleep)
+def run(args, session=None, known_keys=None):
+    # Shared by the CLI and Runner.py; pass `session` to reuse an existing connection pool and
+    # `known_keys` ({summary.lower(): key}, e.g. from Importer.run) for issues too new to trust search for
+    jira = Jira(args.jira_url, args.jira_user, args.jira_token, sleep=args.sleep, session=session)
 
+    # Pass 1: stream the CSV keeping only (summary, depends on) pairs, resolve them all in a few batched searches
     with open(args.csv, newline='', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+        pairs = [(r.get('Summary'), r.get('Depends on')) for r in csv.DictReader(f) if r.get('Summary') and r.get('Depends on')]
+    keys = dict(known_keys or {})
+    unknown = [s for pair in pairs for s in pair if s.strip().lower() not in keys]
+    keys.update(jira.search_keys_by_summary(args.project_key, unknown))
 
     processed = 0
     linked = 0
     link_counter = 0
 
-    for r in rows:
-        src_sum = r.get('Summary')
-        dep_sum = r.get('Depends on')
-        if not dep_sum or not src_sum:
-            continue
+    # Pass 2: plain dict lookups, then link
+    for src_sum, dep_sum in pairs:
         processed += 1
 
-        src_results = jira.search_by_summary(args.project_key, src_sum)
-        dep_results = jira.search_by_summary(args.project_key, dep_sum)
-
-        try:
-            src_key = src_results['issues'][0]['key']
-            dep_key = dep_results['issues'][0]['key']
-        except (KeyError, IndexError):
+        src_key = keys.get(src_sum.strip().lower())
+        dep_key = keys.get(dep_sum.strip().lower())
+        if not src_key or not dep_key:
             print(f"[ERROR] Could not find keys for: {src_sum} or {dep_sum}")
             continue
 
@@ -105,5 +177,8 @@ def main():
 
     print(f"\nFinal Summary: Processed {processed} tasks with dependencies, successfully linked {linked} of them.")
 
+def main():
+    run(parse_args())
+
 if __name__ == '__main__':
     main()
@@ -1,16 +1,30 @@
 #!/usr/bin/env python3
 import os
 import re
+import sys
 import csv
+import json
 import argparse
 import time
-from typing import Dict, Any, Optional, Tuple, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, Tuple, List, Iterator
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import date, datetime
+
+try:
+    import orjson  # optional: faster JSON encoding/decoding
+except ImportError:
+    orjson = None
 
 # === Configuration ===
-REQUEST_DELAY = 0.1   # seconds between API calls
+REQUEST_DELAY = 0.1   # fallback backoff (s) when Jira signals it is near its rate limit
+RATE_LIMIT_FLOOR = 5  # back off once X-RateLimit-Remaining drops below this
 MAX_RETRIES   = 1     # retry once on transient POST failures
+DELETE_WORKERS = 8    # concurrent DELETEs when wiping a project
+BULK_SIZE     = 50    # issues per /issue/bulk create call (Jira's maximum)
+OPTIONAL_FIELDS = ("priority", "labels")  # set from the CSV at creation; dropped if Jira rejects the value
 
 # === Environment ===
 JIRA_URL = os.environ.get("JIRA_URL")
@@ -18,27 +32,82 @@ JIRA_USER = os.environ.get("JIRA_USER")
 JIRA_API_TOKEN = os.environ.get("JIRA_API_TOKEN")
 JIRA_START_DATE_FIELD = os.environ.get("JIRA_START_DATE_FIELD")  # Optional custom start date field
 
+class JiraRetry(Retry):
+    """urllib3 Retry that only re-sends POST (creates) when Jira asks us to come back later (429/503 + Retry-After)."""
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == "POST":
+            return bool(self.total) and has_retry_after and status_code in (429, 503)
+        return super().is_retry(method, status_code, has_retry_after)
+
 SESSION = requests.Session()
 SESSION.auth = (JIRA_USER, JIRA_API_TOKEN)
 SESSION.headers.update({
     "Accept": "application/json",
-    "Content-Type": "application/json"
+    "Content-Type": "application/json",
+    "Connection": "keep-alive"
 })
+# Reuse TCP/TLS connections; 429/5xx are retried with backoff (honours Retry-After).
+# raise_on_status=False hands the last response back, so callers still see the status code.
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=32,
+    max_retries=JiraRetry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                          allowed_methods=["GET", "PUT", "DELETE"], raise_on_status=False)
+))
 
 # === Helpers ===
-DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+SLASH_DATE_RE = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
 
 def clean_date(val: Optional[str]) -> Optional[str]:
+    """CSV date -> YYYY-MM-DD. Gantt exports write m/d/Y (d/m/Y is tried when that is not a valid date); ISO also works."""
     if not val:
         return None
     s = str(val).strip()
-    return s if DATE_RE.match(s) else None
+    m = SLASH_DATE_RE.match(s)
+    if m:
+        a, b, y = (int(g) for g in m.groups())
+        for month, day in ((a, b), (b, a)):
+            try:
+                return date(y, month, day).isoformat()
+            except ValueError:
+                pass
+        return None
+    try:
+        return datetime.fromisoformat(s).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+def dump_json(payload: Dict[str, Any]) -> bytes:
+    """Request body as UTF-8 JSON bytes (orjson when installed)."""
+    return orjson.dumps(payload) if orjson else json.dumps(payload).encode("utf-8")
+
+def load_json(r: requests.Response) -> Dict[str, Any]:
+    """Decode a response body once, straight from bytes (orjson when installed); 204/empty bodies give {}."""
+    if r.status_code == 204 or not r.content:
+        return {}
+    return orjson.loads(r.content) if orjson else json.loads(r.content)
+
+def jql_quote(s: str) -> str:
+    """Quote a value as a JQL string literal (escapes backslashes and double quotes)."""
+    return '"' + s.replace("\\", "\\\\").replace('"', '\\"') + '"'
 
 def require_env():
     missing = [k for k, v in [("JIRA_URL", JIRA_URL), ("JIRA_USER", JIRA_USER), ("JIRA_API_TOKEN", JIRA_API_TOKEN)] if not v]
     if missing:
         raise SystemExit(f"Error: Missing environment variables: {', '.join(missing)}")
 
+def pace(r: requests.Response):
+    """Sleep only when Jira reports we are close to its rate limit (429s themselves are retried by the adapter)."""
+    remaining = r.headers.get("X-RateLimit-Remaining", "")
+    near_limit = r.headers.get("X-RateLimit-NearLimit") == "true"
+    if near_limit or (remaining.isdigit() and int(remaining) < RATE_LIMIT_FLOOR):
+        try:
+            delay = float(r.headers.get("Retry-After", REQUEST_DELAY))
+        except ValueError:
+            delay = REQUEST_DELAY
+        time.sleep(delay)
+
 def jira_post(path: str, json: Dict[str, Any], dry_run: bool = False) -> Tuple[int, Dict[str, Any]]:
     url = f"{JIRA_URL.rstrip('/')}{path}"
     if dry_run:
@@ -48,12 +117,13 @@ def jira_post(path: str, json: Dict[str, Any], dry_run: bool = False) -> Tuple[i
         return 200, {"key": "DRY-KEY"}
     for attempt in range(MAX_RETRIES + 1):
         try:
-            r = SESSION.post(url, json=json)
+            r = SESSION.post(url, data=dump_json(json))
+            pace(r)
             if r.status_code < 400:
-                return r.status_code, (r.json() if r.text else {})
+                return r.status_code, load_json(r)
             else:
                 print(f"Jira POST error {r.status_code}: {r.text}")
-                return r.status_code, (r.json() if r.text else {})
+                return r.status_code, load_json(r)
         except requests.exceptions.RequestException as e:
             if attempt < MAX_RETRIES:
                 print(f"Retrying POST after error: {e}")
@@ -64,9 +134,10 @@ def jira_post(path: str, json: Dict[str, Any], dry_run: bool = False) -> Tuple[i
 def jira_get(path: str, params: Dict[str, Any] = None) -> Tuple[int, Dict[str, Any]]:
     url = f"{JIRA_URL.rstrip('/')}{path}"
     r = SESSION.get(url, params=params or {})
+    pace(r)
     if r.status_code >= 400:
         print(f"Jira GET error {r.status_code}: {r.text}")
-    return r.status_code, (r.json() if r.text else {})
+    return r.status_code, load_json(r)
 
 def jira_delete(path: str, dry_run: bool = False) -> int:
     url = f"{JIRA_URL.rstrip('/')}{path}"
@@ -74,46 +145,47 @@ def jira_delete(path: str, dry_run: bool = False) -> int:
         print(f"[DRY-RUN] DELETE {url}")
         return 204
     r = SESSION.delete(url)
+    pace(r)
     if r.status_code >= 400:
         print(f"Jira DELETE error {r.status_code}: {r.text}")
     return r.status_code
 
-def search_issues(jql: str, fields: str = "key", max_per_page: int = 100) -> List[Dict[str, Any]]:
-    start_at = 0
+def search_issues(jql: str, fields: Optional[List[str]] = None, max_per_page: int = 100) -> List[Dict[str, Any]]:
+    # Cursor-paginated /search/jql (the startAt-based /search endpoint is deprecated)
+    params: Dict[str, Any] = {
+        "jql": jql,
+        "maxResults": max_per_page,
+        "fields": fields or ["key"]
+    }
     issues: List[Dict[str, Any]] = []
     while True:
-        code, resp = jira_get("/rest/api/3/search", params={
-            "jql": jql,
-            "startAt": start_at,
-            "maxResults": max_per_page,
-            "fields": fields
-        })
+        code, resp = jira_get("/rest/api/3/search/jql", params=params)
         if code != 200:
             raise SystemExit(f"Failed to search issues with JQL: {jql}")
-        batch = resp.get("issues", [])
-        if not batch:
-            break
-        issues.extend(batch)
-        if start_at + len(batch) >= resp.get("total", 0):
+        issues.extend(resp.get("issues", []))
+        token = resp.get("nextPageToken")
+        if not token:
             break
-        start_at += len(batch)
+        params["nextPageToken"] = token
     return issues
 
 def wipe_project(project_key: str, dry_run: bool = False):
     print(f"Searching for issues to delete in project {project_key}...")
-    issues = search_issues(f"project = {project_key}", fields="key")
+    issues = search_issues(f"project = {jql_quote(project_key)}", fields=["issuetype"])
     if not issues:
         print("No issues found to delete.")
         return
-    total = len(issues)
-    print(f"Deleting {total} issues in project {project_key}...")
-    for i, issue in enumerate(issues, 1):
-        key = issue["key"]
-        code = jira_delete(f"/rest/api/3/issue/{key}?deleteSubtasks=true", dry_run=dry_run)
-        ok = code in (200, 202, 204)
-        if i == 1 or i % 10 == 0 or i == total:
-            print(f"[{i}/{total}] Delete {key}: {'OK' if ok else f'HTTP {code}'}")
-        time.sleep(REQUEST_DELAY)
+    # Sub-tasks go with their parent (deleteSubtasks=true); deleting them separately would just 404
+    keys = [it["key"] for it in issues if not it.get("fields", {}).get("issuetype", {}).get("subtask")]
+    total = len(keys)
+    print(f"Deleting {total} issues (and {len(issues) - total} sub-tasks with them) in project {project_key}...")
+    with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as ex:
+        futures = {ex.submit(jira_delete, f"/rest/api/3/issue/{key}?deleteSubtasks=true", dry_run): key for key in keys}
+        for i, fut in enumerate(as_completed(futures), 1):
+            code = fut.result()
+            ok = code in (200, 202, 204)
+            if i == 1 or i % 10 == 0 or i == total or not ok:
+                print(f"[{i}/{total}] Delete {futures[fut]}: {'OK' if ok else f'HTTP {code}'}")
     print("Wipe complete.")
 
 def to_adf(text: str) -> Dict[str, Any]:
@@ -132,11 +204,39 @@ def to_adf(text: str) -> Dict[str, Any]:
         }]
     }
 
-def create_issue(fields: Dict[str, Any], dry_run: bool = False) -> Optional[str]:
-    code, resp = jira_post("/rest/api/3/issue", {"fields": fields}, dry_run=dry_run)
-    if code in (200, 201):
-        return resp.get("key")
-    return None
+def optional_fields_only(err: Dict[str, Any]) -> bool:
+    """True when a bulk element was rejected solely over fields in OPTIONAL_FIELDS."""
+    element = err.get("elementErrors") or {}
+    errors = element.get("errors") or {}
+    return bool(errors) and not element.get("errorMessages") and set(errors) <= set(OPTIONAL_FIELDS)
+
+def create_issues_bulk(field_sets: List[Dict[str, Any]], dry_run: bool = False) -> List[Optional[str]]:
+    """Create up to BULK_SIZE issues in one call; returns their keys in submission order (None where Jira rejected one)."""
+    if dry_run:
+        for fields in field_sets:
+            print(f"[DRY-RUN] POST /rest/api/3/issue/bulk :: {fields.get('summary', '(no summary)')}")
+        return ["DRY-KEY"] * len(field_sets)
+    code, resp = jira_post("/rest/api/3/issue/bulk", {"issueUpdates": [{"fields": f} for f in field_sets]})
+    if code not in (200, 201):
+        return [None] * len(field_sets)
+    failed = {}
+    for err in resp.get("errors", []):
+        failed[err.get("failedElementNumber")] = err
+        print(f"Bulk create rejected element {err.get('failedElementNumber')}: {err.get('elementErrors')}")
+    # Successful issues come back in submission order, skipping the failed elements
+    issues = iter(resp.get("issues", []))
+    keys = [None if i in failed else next(issues, {}).get("key") for i in range(len(field_sets))]
+
+    # A bad Priority/Labels cell must not cost the whole issue (and abort the import): create it without them
+    retry = [i for i, err in failed.items() if optional_fields_only(err)]
+    if retry:
+        stripped = [{k: v for k, v in field_sets[i].items() if k not in OPTIONAL_FIELDS} for i in retry]
+        for i, key in zip(retry, create_issues_bulk(stripped)):
+            if key:
+                print(f"Warning: created '{field_sets[i].get('summary')}' ({key}) without "
+                      f"{', '.join(failed[i]['elementErrors']['errors'])}; Jira rejected the value")
+                keys[i] = key
+    return keys
 
 def link_issue(inward_key: str, outward_key: str, dry_run: bool = False) -> bool:
     payload = {
@@ -147,21 +247,35 @@ def link_issue(inward_key: str, outward_key: str, dry_run: bool = False) -> bool
     code, _ = jira_post("/rest/api/3/issueLink", payload, dry_run=dry_run)
     return code in (200, 201)
 
-def parse_args():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     ap = argparse.ArgumentParser(description="Import Jira Tasks + Sub-tasks from CLEAN CSV. Wipes project by default unless --no-wipe.")
     ap.add_argument("--csv", required=True, help="Path to CLEAN CSV with tasks/subtasks")
     ap.add_argument("--project-key", required=True, help="Jira project key")
     ap.add_argument("--dry-run", action="store_true", help="Only print what would happen, do not modify Jira")
     ap.add_argument("--no-wipe", action="store_true", help="Do NOT delete all issues in the project before import")
-    return ap.parse_args()
+    return ap.parse_args(argv)
 
-def read_csv(path: str) -> List[Dict[str, str]]:
-    with open(path, newline="", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+REQUIRED_COLUMNS = ("Summary", "Issue Type")
 
-def main():
+def read_csv(path: str) -> Iterator[Dict[str, str]]:
+    # Opened and header-checked eagerly, so a bad --csv fails before the project is wiped;
+    # only the rows themselves are streamed. utf-8-sig drops the BOM spreadsheet exports add.
+    f = open(path, newline="", encoding="utf-8-sig")
+    reader = csv.DictReader(f)
+    missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        f.close()
+        raise SystemExit(f"{path}: missing required column(s): {', '.join(missing)}")
+
+    def rows() -> Iterator[Dict[str, str]]:
+        with f:
+            yield from reader
+    return rows()
+
+def run(args: argparse.Namespace) -> Dict[str, str]:
+    """Import the CSV; returns {summary.lower(): key} for the issues created (newest wins on duplicates).
+    Runner.py hands that to the later phases so they don't depend on the (eventually consistent) search index."""
     require_env()
-    args = parse_args()
     rows = read_csv(args.csv)
 
     # Sanity check: each Task should be followed by two Sub-tasks (Design, Approval)
@@ -171,86 +285,116 @@ def main():
     if not args.no_wipe:
         wipe_project(args.project_key, dry_run=args.dry_run)
 
-    created: Dict[str, str] = {}
+    # Until Jira hands out keys, issues are referred to by creation ordinal: task_keys[i] / subtask_keys[j].
+    # The summary indexes are filled as rows are read, so a name always resolves to the latest issue with
+    # that summary above the current row (as a one-by-one import would), even when summaries repeat.
+    task_keys: List[str] = []
+    subtask_keys: List[str] = []
+    task_by_summary: Dict[str, int] = {}
+    subtask_by_summary: Dict[Tuple[int, str], int] = {}  # (parent task ordinal, summary) -> sub-task ordinal
+    pending_deps: List[Tuple[List[str], int, int]] = []  # (keys list, ordinal) of the dependency, sub-task ordinal
     pending_links: List[Tuple[str, str]] = []
-    current_parent: Optional[str] = None
-    total_rows = len(rows)
+    created: Dict[str, str] = {}
+    current_parent: Optional[int] = None
+    total_rows = 0
+
+    # Issues are created through /issue/bulk, BULK_SIZE at a time. Sub-tasks need their parent's
+    # key, so the task buffer is always flushed before the sub-task buffer.
+    task_buffer: List[Tuple[str, Dict[str, Any]]] = []
+    subtask_buffer: List[Tuple[int, str, Dict[str, Any]]] = []
+
+    def flush_tasks():
+        if not task_buffer:
+            return
+        keys = create_issues_bulk([fields for _, fields in task_buffer], dry_run=args.dry_run)
+        for (summary, _), key in zip(task_buffer, keys):
+            if not key:
+                raise SystemExit(f"Failed to create task '{summary}'")
+            task_keys.append(key)
+            created[summary.strip().lower()] = key
+            if len(task_keys) == 1 or len(task_keys) % 10 == 0:
+                print(f"[{len(task_keys)}] Created Task: {summary} ({key})")
+        task_buffer.clear()
+
+    def flush_subtasks():
+        flush_tasks()
+        if not subtask_buffer:
+            return
+        for parent, _, fields in subtask_buffer:
+            fields["parent"] = {"key": task_keys[parent]}
+        keys = create_issues_bulk([fields for _, _, fields in subtask_buffer], dry_run=args.dry_run)
+        for (parent, summary, _), key in zip(subtask_buffer, keys):
+            if not key:
+                raise SystemExit(f"Failed to create subtask '{summary}' for parent {task_keys[parent]}")
+            subtask_keys.append(key)
+            created[summary.strip().lower()] = key
+        subtask_buffer.clear()
 
     print("Creating tasks and subtasks...")
     for idx, row in enumerate(rows, 1):
-        summary = row["Summary"]
-        description = to_adf(row.get("Description", ""))
+        total_rows = idx
+        summary = sys.intern(row["Summary"])
         issue_type = row["Issue Type"]
-        start_date = row.get("Start date")
-        due_date = row.get("Due date")
         depends_on = (row.get("Depends on") or "").strip()
 
-        if issue_type == "Task":
-            fields: Dict[str, Any] = {
-                "summary": summary,
-                "project": {"key": args.project_key},
-                "issuetype": {"name": "Task"},
-                "description": description
-            }
-            due_clean = clean_date(due_date)
-            if due_clean:
-                fields["duedate"] = due_clean
-            if JIRA_START_DATE_FIELD:
-                start_clean = clean_date(start_date)
-                if start_clean:
-                    fields[JIRA_START_DATE_FIELD] = start_clean
-
-            key = create_issue(fields, dry_run=args.dry_run)
-            if not key:
-                raise SystemExit(f"Failed to create task '{summary}'")
-            created[summary] = key
-            current_parent = summary
+        if issue_type not in ("Task", "Sub-task"):
+            continue
 
-            if idx == 1 or idx % 10 == 0 or idx == total_rows:
-                print(f"[{idx}/{total_rows}] Created Task: {summary} ({key})")
+        fields: Dict[str, Any] = {
+            "summary": summary,
+            "project": {"key": args.project_key},
+            "issuetype": {"name": issue_type},
+            "description": to_adf(row.get("Description", ""))
+        }
+        due_clean = clean_date(row.get("Due date"))
+        if due_clean:
+            fields["duedate"] = due_clean
+        if JIRA_START_DATE_FIELD:
+            start_clean = clean_date(row.get("Start date"))
+            if start_clean:
+                fields[JIRA_START_DATE_FIELD] = start_clean
+        # Optional columns that need no lookups are set at creation rather than by ColumnUpdater
+        priority = (row.get("Priority") or "").strip()
+        if priority:
+            fields["priority"] = {"name": priority}
+        labels = [x.strip() for x in (row.get("Labels") or "").split(",") if x.strip()]
+        if labels:
+            fields["labels"] = labels
 
-        elif issue_type == "Sub-task":
-            if not current_parent or current_parent not in created:
+        if issue_type == "Task":
+            current_parent = len(task_keys) + len(task_buffer)
+            task_by_summary[summary] = current_parent
+            task_buffer.append((summary, fields))
+            if len(task_buffer) >= BULK_SIZE:
+                flush_tasks()
+        else:
+            if current_parent is None:
                 raise SystemExit(f"Subtask '{summary}' found without a valid parent task")
-            fields = {
-                "summary": summary,
-                "project": {"key": args.project_key},
-                "issuetype": {"name": "Sub-task"},
-                "description": description,
-                "parent": {"key": created[current_parent]}
-            }
-            due_clean = clean_date(due_date)
-            if due_clean:
-                fields["duedate"] = due_clean
-            if JIRA_START_DATE_FIELD:
-                start_clean = clean_date(start_date)
-                if start_clean:
-                    fields[JIRA_START_DATE_FIELD] = start_clean
-
-            key = create_issue(fields, dry_run=args.dry_run)
-            if not key:
-                raise SystemExit(f"Failed to create subtask '{summary}' for parent '{current_parent}'")
-            created[f"{current_parent}:{summary}"] = key
-
+            ordinal = len(subtask_keys) + len(subtask_buffer)
             if depends_on:
-                # Allow dependency on another Task or on a sibling subtask name
-                dep_key = (
-                    created.get(depends_on) or
-                    created.get(f"{depends_on}:Design") or
-                    created.get(f"{depends_on}:Approval")
-                )
-                if dep_key:
-                    pending_links.append((dep_key, key))
+                # Allow dependency on a sibling subtask name or on another Task
+                sibling = subtask_by_summary.get((current_parent, depends_on))
+                if sibling is not None:
+                    pending_deps.append((subtask_keys, sibling, ordinal))
+                elif depends_on in task_by_summary:
+                    pending_deps.append((task_keys, task_by_summary[depends_on], ordinal))
                 else:
                     print(f"Warning: Could not resolve dependency '{depends_on}' for '{summary}'")
+            subtask_by_summary[(current_parent, summary)] = ordinal
+            subtask_buffer.append((current_parent, summary, fields))
+            if len(subtask_buffer) >= BULK_SIZE:
+                flush_subtasks()
+
+    flush_subtasks()
+    print(f"Processed {total_rows} rows.")
 
-        time.sleep(REQUEST_DELAY)
+    for keys, dep, ordinal in pending_deps:
+        pending_links.append((keys[dep], subtask_keys[ordinal]))
 
     if pending_links:
         print("Linking dependencies...")
         for dep_key, tgt_key in pending_links:
             link_issue(dep_key, tgt_key, dry_run=args.dry_run)
-            time.sleep(REQUEST_DELAY)
         print("Dependency linking complete.")
     else:
         print("No dependencies to link.")
@@ -258,6 +402,11 @@ def main():
     print("Import complete.")
     if args.dry_run:
         print("Dry-run mode: no issues actually created.")
+        return {}
+    return created
+
+def main():
+    run(parse_args())
 
 if __name__ == "__main__":
     main()
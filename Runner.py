@@ -1,15 +1,18 @@
-import subprocess
 import sys
 import argparse
 
-def run_script(script_name, args):
-    """Run a Python script with the given arguments."""
-    command = [sys.executable, script_name] + args
+import Importer
+import ColumnUpdater
+import DependencyUpdater
+
+def run_script(name, entry, args, **kwargs):
+    """Run a script's entry point in-process with the given parsed arguments; returns what it returns."""
     try:
-        result = subprocess.run(command, check=True, text=True)
-        print(f"Successfully ran {script_name}")
-    except subprocess.CalledProcessError as e:
-        print(f"Error running {script_name}: {e}")
+        result = entry(args, **kwargs)
+        print(f"Successfully ran {name}")
+        return result
+    except (Exception, SystemExit) as e:
+        print(f"Error running {name}: {e}")
         sys.exit(1)
 
 def main():
@@ -27,29 +30,34 @@ def main():
     dry_run_flag = ["--dry-run"] if args.dry_run else []
     no_wipe_flag = ["--no-wipe"] if args.no_wipe else []
 
+    # All three phases share Importer's session, and with it one keep-alive connection pool
+    session = Importer.SESSION
+
     # Run Importer.py
     print("Running Importer.py...")
-    run_script("Importer.py", [
+    # Importer returns {summary: key} for what it created. Jira's search is eventually consistent, so
+    # right after the import those issues may be missing from it; the later phases look them up here instead.
+    created = run_script("Importer.py", Importer.run, Importer.parse_args([
         "--csv", csv_file,
         "--project-key", project_key
-    ] + dry_run_flag + no_wipe_flag)
+    ] + dry_run_flag + no_wipe_flag))
 
     # Run ColumnUpdater.py
     print("Running ColumnUpdater.py...")
-    run_script("ColumnUpdater.py", [
+    run_script("ColumnUpdater.py", ColumnUpdater.run, ColumnUpdater.parse_args([
         "--csv", csv_file,
         "--project-key", project_key,
         "--startdate-field", "customfield_12345"  # Replace with your actual custom field ID if needed
-    ] + dry_run_flag)
+    ] + dry_run_flag), session=session, known_keys=created)
 
     # Run DependencyUpdater.py
     print("Running DependencyUpdater.py...")
-    run_script("DependencyUpdater.py", [
+    run_script("DependencyUpdater.py", DependencyUpdater.run, DependencyUpdater.parse_args([
         "--csv", csv_file,
         "--project-key", project_key
-    ] + dry_run_flag)
+    ] + dry_run_flag), session=session, known_keys=created)
 
     print("All scripts executed successfully.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()